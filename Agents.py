@@ -5,16 +5,46 @@ Research Agents Module
 Contains all specialized agents for the deep research system.
 """
 
+import asyncio
+import os
 import re
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict
 from urllib.parse import urlparse
 
 from .core import (
-    Agent, Source, ResearchTask, ResearchPlan, 
+    Agent, Source, ResearchTask, ResearchPlan,
     ResearchFindings, SourceQuality
 )
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# Planning keywords found in one scan over the lowercased query
+# ('versus' before 'vs' so the longer form wins at the same position)
+_PLAN_KEYWORD_RE = re.compile(r'pros and cons|compare|versus|vs|electric|gas')
+
+# Splits "X vs Y" / "X versus Y" comparisons in a single pass
+_VS_RE = re.compile(r'\b(?:vs\.?|versus)\b')
+
+# Theme extraction: words of 4+ letters, minus common stop words
+_TOKEN_RE = re.compile(r'[a-z]{4,}')
+_STOP_WORDS = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of',
+    'with', 'by', 'a', 'an'
+})
+
+
+@lru_cache(maxsize=4096)
+def _domain_of(url: str) -> str:
+    """Extract the lowercased domain from a URL (memoized, URLs repeat heavily)."""
+    return urlparse(url).netloc.lower()
+
 
 class PlanningAgent(Agent):
     """Breaks down complex research questions into manageable tasks."""
@@ -24,7 +54,7 @@ class PlanningAgent(Agent):
     
     async def execute(self, query: str) -> ResearchPlan:
         """Break down the main query into specific research tasks."""
-        self.logger.info(f"Planning research for: {query}")
+        self.logger.info("Planning research for: %s", query)
         
         # Analyze query complexity and create subtasks
         tasks = await self._create_research_tasks(query)
@@ -34,17 +64,21 @@ class PlanningAgent(Agent):
             tasks=tasks
         )
         
-        self.logger.info(f"Created research plan with {len(tasks)} tasks")
+        self.logger.info("Created research plan with %d tasks", len(tasks))
         return plan
     
     async def _create_research_tasks(self, query: str) -> List[ResearchTask]:
         """Create specific research tasks based on the main query."""
         tasks = []
-        
+
+        # Lowercase once and find all planning keywords in a single scan
+        q_lc = query.lower()
+        keywords = set(_PLAN_KEYWORD_RE.findall(q_lc))
+
         # Basic task decomposition logic
-        if "compare" in query.lower():
+        if "compare" in keywords:
             # Extract items to compare
-            items = self._extract_comparison_items(query)
+            items = self._extract_comparison_items(q_lc, keywords)
             for i, item in enumerate(items):
                 task = ResearchTask(
                     id=f"compare_{i}",
@@ -52,7 +86,7 @@ class PlanningAgent(Agent):
                     priority=1
                 )
                 tasks.append(task)
-        elif "pros and cons" in query.lower():
+        elif "pros and cons" in keywords:
             # Create tasks for advantages and disadvantages
             tasks.append(ResearchTask("pros", f"Advantages of {query}", 1))
             tasks.append(ResearchTask("cons", f"Disadvantages of {query}", 1))
@@ -64,52 +98,56 @@ class PlanningAgent(Agent):
         
         return tasks
     
-    def _extract_comparison_items(self, query: str) -> List[str]:
-        """Extract items to compare from query."""
+    def _extract_comparison_items(self, q_lc: str, keywords: set) -> List[str]:
+        """Extract items to compare from the lowercased query."""
         # Simple extraction logic - can be enhanced with NLP
-        if "vs" in query.lower():
-            items = query.lower().split("vs")
-        elif "versus" in query.lower():
-            items = query.lower().split("versus")
-        elif "electric" in query.lower() and "gas" in query.lower():
+        parts = _VS_RE.split(q_lc)
+        if len(parts) > 1:
+            items = parts
+        elif "electric" in keywords and "gas" in keywords:
             items = ["electric vehicles", "gas vehicles"]
         else:
             # Default fallback
-            items = [query]
-        
+            items = [q_lc]
+
         return [item.strip() for item in items[:5]]  # Limit to 5 items
 
 
 class SearchAgent(Agent):
     """Conducts web searches for specific research tasks."""
-    
-    def __init__(self, search_provider):
+
+    def __init__(self, search_provider, search_semaphore=None):
         super().__init__("SearchAgent")
         self.search_provider = search_provider
         self.source_checker = SourceCheckerAgent()
-    
+        # Bound concurrent provider calls so parallel tasks don't flood the API
+        self._search_sem = search_semaphore or asyncio.Semaphore(
+            int(os.getenv("MAX_PARALLEL_SEARCHES", "20"))
+        )
+
     async def execute(self, task: ResearchTask) -> ResearchTask:
         """Execute search for a research task."""
-        self.logger.info(f"Searching for: {task.query}")
-        
-        # Perform search
-        results = await self.search_provider.search(task.query, num_results=10)
-        
-        # Convert results to Sources with quality assessment
-        sources = []
-        for result in results:
-            source = Source(
+        self.logger.info("Searching for: %s", task.query)
+
+        # Perform search (bounded by the shared semaphore)
+        async with self._search_sem:
+            results = await self.search_provider.search(task.query, num_results=10)
+
+        # Convert results to Sources, assessing quality as they arrive
+        sources = [
+            Source(
                 url=result.get('url', ''),
                 title=result.get('title', ''),
                 snippet=result.get('content', ''),
                 quality=self.source_checker.assess_quality(result.get('url', ''))
             )
-            sources.append(source)
-        
+            for result in results
+        ]
+
         task.results = sources
         task.completed = True
-        
-        self.logger.info(f"Found {len(sources)} sources for task {task.id}")
+
+        self.logger.info("Found %d sources for task %s", len(sources), task.id)
         return task
 
 
@@ -133,66 +171,136 @@ class SourceCheckerAgent(Agent):
         self.low_quality_indicators = {
             'blog', 'personal', 'forum', 'reddit.com'
         }
-    
+
+        indicator_buckets = [
+            (0, SourceQuality.HIGH, self.high_quality_domains),
+            (1, SourceQuality.MEDIUM, self.medium_quality_indicators),
+            (2, SourceQuality.LOW, self.low_quality_indicators),
+        ]
+
+        # Split indicators into two kinds: registered domains and bare TLDs
+        # go into an exact suffix index (O(1) dict probes per domain label),
+        # while generic keywords like 'blog' keep substring semantics.
+        # Bare three-letter entries ('edu', 'gov', 'org') are TLDs.
+        self._suffix_map = {}
+        keyword_indicators = []
+        for priority, quality, indicators in indicator_buckets:
+            for indicator in indicators:
+                if '.' in indicator or len(indicator) == 3:
+                    self._suffix_map.setdefault(indicator, quality)
+                else:
+                    keyword_indicators.append((priority, quality, indicator))
+        self._keyword_indicators = keyword_indicators
+
+        # Build an Aho-Corasick automaton so a single pass over the domain
+        # matches every keyword indicator at once instead of one scan each.
+        # Lower priority wins when several indicators match (HIGH beats LOW).
+        self.automaton = None
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for priority, quality, indicator in keyword_indicators:
+                self.automaton.add_word(indicator, (priority, quality))
+            self.automaton.make_automaton()
+
+        # Many URLs share a domain, so cache the classification per domain
+        self._classify_domain = lru_cache(maxsize=4096)(self._classify_domain)
+
     def assess_quality(self, url: str) -> SourceQuality:
         """Assess the quality of a source based on its URL."""
         if not url:
             return SourceQuality.LOW
-        
-        domain = urlparse(url).netloc.lower()
-        
-        # Check for high quality indicators
-        for indicator in self.high_quality_domains:
-            if indicator in domain:
-                return SourceQuality.HIGH
-        
-        # Check for medium quality indicators
-        for indicator in self.medium_quality_indicators:
-            if indicator in domain:
-                return SourceQuality.MEDIUM
-        
-        # Check for low quality indicators
-        for indicator in self.low_quality_indicators:
-            if indicator in domain:
-                return SourceQuality.LOW
-        
+
+        return self._classify_domain(_domain_of(url))
+
+    def _classify_domain(self, domain: str) -> SourceQuality:
+        """Classify a lowercased domain against the quality indicators."""
+        # Probe the suffix index from most- to least-specific, so
+        # 'en.wikipedia.org' hits 'wikipedia.org' before the bare 'org' TLD
+        parts = domain.split('.')
+        for i in range(len(parts)):
+            quality = self._suffix_map.get('.'.join(parts[i:]))
+            if quality is not None:
+                return quality
+
+        # Keyword indicators keep substring semantics
+        if self.automaton is not None:
+            best = None
+            for _, hit in self.automaton.iter(domain):
+                if best is None or hit < best:
+                    best = hit
+            if best is not None:
+                return best[1]
+        else:
+            # Fallback path when pyahocorasick is not installed
+            for _, quality, indicator in self._keyword_indicators:
+                if indicator in domain:
+                    return quality
+
         # Default to medium if unknown
         return SourceQuality.MEDIUM
     
     async def execute(self, sources: List[Source]) -> List[Source]:
         """Re-assess and validate source quality."""
-        for source in sources:
-            source.quality = self.assess_quality(source.url)
-        
+        # Pre-extract every domain, classify each distinct domain once,
+        # then fan the verdicts back out to the sources
+        domains = [_domain_of(source.url) if source.url else None for source in sources]
+        quality_by_domain = {
+            domain: self._classify_domain(domain)
+            for domain in set(domains) if domain is not None
+        }
+
+        for source, domain in zip(sources, domains):
+            source.quality = (quality_by_domain[domain] if domain is not None
+                              else SourceQuality.LOW)
+
         return sources
 
 
 class ConflictDetectionAgent(Agent):
     """Identifies conflicting information across sources."""
-    
+
+    # Contradictory keywords used for simple conflict detection
+    positive_indicators = ['benefit', 'advantage', 'positive', 'good', 'better', 'improved']
+    negative_indicators = ['problem', 'disadvantage', 'negative', 'bad', 'worse', 'harmful']
+
     def __init__(self):
         super().__init__("ConflictDetection")
-    
+
+        # One automaton over all 12 keywords: a single pass per source text
+        # replaces twelve separate substring scans.
+        self.automaton = None
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for word in self.positive_indicators:
+                self.automaton.add_word(word, 1)
+            for word in self.negative_indicators:
+                self.automaton.add_word(word, -1)
+            self.automaton.make_automaton()
+
+    def _score(self, text: str) -> int:
+        """Net positive/negative keyword score for a source text."""
+        if self.automaton is not None:
+            return sum(value for _, value in self.automaton.iter(text))
+
+        # Fallback path when pyahocorasick is not installed; counts
+        # occurrences, matching the automaton's scoring semantics
+        pos_count = sum(text.count(word) for word in self.positive_indicators)
+        neg_count = sum(text.count(word) for word in self.negative_indicators)
+        return pos_count - neg_count
+
     async def execute(self, sources: List[Source]) -> List[str]:
         """Detect conflicts between sources."""
         conflicts = []
-        
-        # Simple conflict detection based on contradictory keywords
-        positive_indicators = ['benefit', 'advantage', 'positive', 'good', 'better', 'improved']
-        negative_indicators = ['problem', 'disadvantage', 'negative', 'bad', 'worse', 'harmful']
-        
+
         positive_sources = []
         negative_sources = []
-        
+
         for source in sources:
-            text = (source.title + " " + source.snippet).lower()
-            
-            pos_count = sum(1 for word in positive_indicators if word in text)
-            neg_count = sum(1 for word in negative_indicators if word in text)
-            
-            if pos_count > neg_count:
+            score = self._score(source.text_lc)
+
+            if score > 0:
                 positive_sources.append(source)
-            elif neg_count > pos_count:
+            elif score < 0:
                 negative_sources.append(source)
         
         if positive_sources and negative_sources:
@@ -215,20 +323,26 @@ class SynthesisAgent(Agent):
                      conflicts: List[str]) -> ResearchFindings:
         """Synthesize all research into final findings."""
         self.logger.info("Synthesizing research findings")
-        
+
+        # Bucket sources by quality once; reused by insights and the report
+        quality_buckets = {quality: [] for quality in SourceQuality}
+        for source in all_sources:
+            quality_buckets[source.quality].append(source)
+
         # Extract key insights
-        insights = await self._extract_insights(all_sources)
-        
+        insights = await self._extract_insights(all_sources, quality_buckets)
+
         # Create citation mapping
         citations = {source.url: i+1 for i, source in enumerate(all_sources)}
-        
+
         # Generate comprehensive report
         report = await self._generate_report(
-            research_plan.main_query, 
-            insights, 
-            all_sources, 
-            conflicts, 
-            citations
+            research_plan.main_query,
+            insights,
+            all_sources,
+            conflicts,
+            citations,
+            quality_buckets
         )
         
         findings = ResearchFindings(
@@ -242,14 +356,15 @@ class SynthesisAgent(Agent):
         
         return findings
     
-    async def _extract_insights(self, sources: List[Source]) -> List[str]:
+    async def _extract_insights(self, sources: List[Source],
+                                quality_buckets: Dict[SourceQuality, List[Source]]) -> List[str]:
         """Extract key insights from sources."""
         insights = []
-        
-        # Group sources by quality
-        high_quality = [s for s in sources if s.quality == SourceQuality.HIGH]
-        medium_quality = [s for s in sources if s.quality == SourceQuality.MEDIUM]
-        
+
+        # Sources are already grouped by quality
+        high_quality = quality_buckets[SourceQuality.HIGH]
+        medium_quality = quality_buckets[SourceQuality.MEDIUM]
+
         if high_quality:
             insights.append(f"High-quality sources ({len(high_quality)}) provide authoritative information")
         
@@ -257,7 +372,7 @@ class SynthesisAgent(Agent):
             insights.append(f"Additional context from {len(medium_quality)} medium-quality sources")
         
         # Extract common themes (simplified)
-        all_text = " ".join([s.title + " " + s.snippet for s in sources]).lower()
+        all_text = " ".join(s.text_lc for s in sources)
         common_words = self._find_common_themes(all_text)
         
         if common_words:
@@ -267,66 +382,68 @@ class SynthesisAgent(Agent):
     
     def _find_common_themes(self, text: str) -> List[str]:
         """Find common themes in text (simplified implementation)."""
-        # Remove common stop words and find frequent terms
-        stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an'}
-        words = re.findall(r'\b\w+\b', text.lower())
-        word_freq = {}
-        
-        for word in words:
-            if word not in stop_words and len(word) > 3:
-                word_freq[word] = word_freq.get(word, 0) + 1
-        
+        # Count 4+ letter words (caller already lowercased), skipping stop
+        # words. findall keeps the whole scan in C — no Match objects
+        counts = Counter(
+            word for word in _TOKEN_RE.findall(text)
+            if word not in _STOP_WORDS
+        )
+
         # Return most frequent words
-        return sorted(word_freq.keys(), key=lambda x: word_freq[x], reverse=True)[:10]
+        return [word for word, _ in counts.most_common(10)]
     
-    async def _generate_report(self, query: str, insights: List[str], 
-                              sources: List[Source], conflicts: List[str], 
-                              citations: Dict[str, int]) -> str:
+    async def _generate_report(self, query: str, insights: List[str],
+                              sources: List[Source], conflicts: List[str],
+                              citations: Dict[str, int],
+                              quality_buckets: Dict[SourceQuality, List[Source]]) -> str:
         """Generate comprehensive research report."""
-        
-        report = f"""# Research Report: {query}
+
+        # Accumulate fragments and join once at the end; repeated str +=
+        # can go quadratic as the report grows
+        parts = [f"""# Research Report: {query}
 
 ## Executive Summary
 This report presents findings from a comprehensive analysis of {len(sources)} sources regarding "{query}". The research was conducted using a multi-agent system that evaluated source quality, detected conflicts, and synthesized key insights.
 
 ## Key Findings
-"""
-        
+"""]
+
         for i, insight in enumerate(insights, 1):
-            report += f"{i}. {insight}\n"
-        
+            parts.append(f"{i}. {insight}\n")
+
         if conflicts:
-            report += "\n## Conflicting Information\n"
+            parts.append("\n## Conflicting Information\n")
             for conflict in conflicts:
-                report += f"⚠️ {conflict}\n"
-        
-        report += "\n## Source Quality Distribution\n"
-        high_count = len([s for s in sources if s.quality == SourceQuality.HIGH])
-        medium_count = len([s for s in sources if s.quality == SourceQuality.MEDIUM])
-        low_count = len([s for s in sources if s.quality == SourceQuality.LOW])
-        
-        report += f"- **High Quality Sources**: {high_count} (.edu, .gov, major news)\n"
-        report += f"- **Medium Quality Sources**: {medium_count} (Wikipedia, industry sites)\n"
-        report += f"- **Low Quality Sources**: {low_count} (blogs, forums)\n"
-        
-        report += "\n## Detailed Analysis\n"
-        
+                parts.append(f"⚠️ {conflict}\n")
+
+        parts.append("\n## Source Quality Distribution\n")
+        high_count = len(quality_buckets[SourceQuality.HIGH])
+        medium_count = len(quality_buckets[SourceQuality.MEDIUM])
+        low_count = len(quality_buckets[SourceQuality.LOW])
+
+        parts.append(f"- **High Quality Sources**: {high_count} (.edu, .gov, major news)\n")
+        parts.append(f"- **Medium Quality Sources**: {medium_count} (Wikipedia, industry sites)\n")
+        parts.append(f"- **Low Quality Sources**: {low_count} (blogs, forums)\n")
+
+        parts.append("\n## Detailed Analysis\n")
+
         # Group findings by source quality
         for quality in [SourceQuality.HIGH, SourceQuality.MEDIUM]:
-            quality_sources = [s for s in sources if s.quality == quality]
+            quality_sources = quality_buckets[quality]
             if quality_sources:
-                report += f"\n### {quality.value.title()} Quality Sources\n"
+                parts.append(f"\n### {quality.value.title()} Quality Sources\n")
                 for source in quality_sources[:5]:  # Limit to top 5 per category
                     citation_num = citations[source.url]
-                    report += f"- {source.title} [{citation_num}]\n"
-                    report += f"  {source.snippet[:150]}...\n\n"
-        
-        report += "\n## References\n"
+                    parts.append(f"- {source.title} [{citation_num}]\n")
+                    parts.append(f"  {source.snippet[:150]}...\n\n")
+
+        parts.append("\n## References\n")
+        by_url = {s.url: s for s in sources}
         for url, num in sorted(citations.items(), key=lambda x: x[1]):
-            source = next((s for s in sources if s.url == url), None)
+            source = by_url.get(url)
             if source:
-                report += f"[{num}] {source.title} - {url}\n"
-        
-        report += f"\n---\n*Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*"
-        
-        return report
\ No newline at end of file
+                parts.append(f"[{num}] {source.title} - {url}\n")
+
+        parts.append(f"\n---\n*Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*")
+
+        return "".join(parts)
\ No newline at end of file
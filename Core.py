@@ -14,6 +14,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, Any
 from urllib.parse import urlparse
 
@@ -23,6 +24,12 @@ import requests
 # Configure logging
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=4096)
+def _domain_of(url: str) -> str:
+    """Extract the lowercased domain from a URL (memoized, URLs repeat heavily)."""
+    return urlparse(url).netloc.lower()
+
 class SourceQuality(Enum):
     HIGH = "high"      # .edu, .gov, major news
     MEDIUM = "medium"  # Wikipedia, industry sites
@@ -37,11 +44,16 @@ class Source:
     snippet: str
     quality: SourceQuality
     timestamp: datetime = field(default_factory=datetime.now)
-    
+    text_lc: str = field(default="", init=False, repr=False)
+
+    def __post_init__(self):
+        # Case-fold title + snippet once; downstream agents scan this a lot
+        self.text_lc = (self.title + " " + self.snippet).lower()
+
     def get_domain(self) -> str:
         """Extract domain from URL."""
         try:
-            return urlparse(self.url).netloc.lower()
+            return _domain_of(self.url)
         except:
             return "unknown"
 
@@ -101,7 +113,8 @@ class Agent(ABC):
 class DeepResearchSystem:
     """Main orchestrator for the multi-agent research system."""
     
-    def __init__(self, search_provider: Optional[SearchProvider] = None):
+    def __init__(self, search_provider: Optional[SearchProvider] = None,
+                 revalidate_sources: bool = False):
         from .search_providers import get_default_search_provider
         from .agents import (
             PlanningAgent, SearchAgent, SourceCheckerAgent, 
@@ -109,10 +122,16 @@ class DeepResearchSystem:
         )
         
         self.search_provider = search_provider or get_default_search_provider()
-        
+        self.revalidate_sources = revalidate_sources
+
+        # Cap concurrent provider calls across all research tasks
+        self._search_sem = asyncio.Semaphore(
+            int(os.getenv("MAX_PARALLEL_SEARCHES", "20"))
+        )
+
         # Initialize agents
         self.planning_agent = PlanningAgent()
-        self.search_agent = SearchAgent(self.search_provider)
+        self.search_agent = SearchAgent(self.search_provider, self._search_sem)
         self.source_checker = SourceCheckerAgent()
         self.conflict_detector = ConflictDetectionAgent()
         self.synthesis_agent = SynthesisAgent()
@@ -121,41 +140,63 @@ class DeepResearchSystem:
     
     async def research(self, query: str) -> ResearchFindings:
         """Conduct comprehensive research on a query."""
-        self.logger.info(f"Starting deep research for: {query}")
+        self.logger.info("Starting deep research for: %s", query)
         
         # Phase 1: Planning
         research_plan = await self.planning_agent.execute(query)
         
         # Phase 2: Parallel Research
-        all_sources = []
         tasks = []
-        
+
         # Execute research tasks in parallel
         for task in research_plan.tasks:
             task_coroutine = self.search_agent.execute(task)
             tasks.append(task_coroutine)
-        
-        # Wait for all tasks to complete
-        completed_tasks = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Collect all sources
-        for completed_task in completed_tasks:
+
+        # Collect and deduplicate sources as each task finishes, so the
+        # merge work overlaps with the remaining network I/O instead of
+        # waiting for the slowest search (overlapping subqueries often
+        # return the same pages; first occurrence wins)
+        seen: Dict[str, Source] = {}
+        for future in asyncio.as_completed(tasks):
+            try:
+                completed_task = await future
+            except Exception as e:
+                self.logger.error("Research task failed: %s", e)
+                continue
             if isinstance(completed_task, ResearchTask):
-                all_sources.extend(completed_task.results)
-        
-        # Phase 3: Quality Assessment
-        all_sources = await self.source_checker.execute(all_sources)
+                for source in completed_task.results:
+                    seen.setdefault(source.url, source)
+        all_sources = list(seen.values())
         
-        # Phase 4: Conflict Detection
+        # Quality was already assessed per-source in SearchAgent; only
+        # re-run the checker when explicitly requested
+        if self.revalidate_sources:
+            all_sources = await self.source_checker.execute(all_sources)
+
+        # Phase 3: Conflict Detection
         conflicts = await self.conflict_detector.execute(all_sources)
         
-        # Phase 5: Synthesis
+        # Phase 4: Synthesis
         findings = await self.synthesis_agent.execute(research_plan, all_sources, conflicts)
         
-        self.logger.info(f"Research completed. Found {len(all_sources)} sources with {len(conflicts)} conflicts detected.")
+        self.logger.info("Research completed. Found %d sources with %d conflicts detected.",
+                         len(all_sources), len(conflicts))
         
         return findings
     
+    async def close(self):
+        """Release provider resources (e.g. pooled HTTP connections)."""
+        close = getattr(self.search_provider, "close", None)
+        if close is not None:
+            await close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
     def print_findings(self, findings: ResearchFindings):
         """Print research findings in a formatted way."""
         print("=" * 80)
@@ -8,6 +8,7 @@ import asyncio
 import logging
 import os
 import sys
+from collections import Counter
 from typing import List
 
 from dotenv import load_dotenv
@@ -32,108 +33,109 @@ def setup_logging():
 
 async def run_test_queries():
     """Run predefined test queries to validate the system."""
-    system = DeepResearchSystem()
-    
     test_queries = [
         "What are pros and cons of electric cars?",
-        "Compare renewable energy vs fossil fuels", 
+        "Compare renewable energy vs fossil fuels",
         "Environmental impact of cryptocurrency mining",
         "Benefits and risks of artificial intelligence in healthcare"
     ]
-    
+
     print("🔬 Running Deep Research System Tests")
     print("=" * 60)
-    
-    for i, query in enumerate(test_queries, 1):
-        print(f"\n📋 Test {i}/{len(test_queries)}: {query}")
-        print("-" * 60)
-        
-        try:
-            findings = await system.research(query)
-            
-            # Print summary
-            print(f"✅ Research completed successfully!")
-            print(f"📊 Sources found: {len(findings.sources)}")
-            print(f"🏆 High quality sources: {len([s for s in findings.sources if s.quality == SourceQuality.HIGH])}")
-            print(f"⚠️  Conflicts detected: {len(findings.conflicts)}")
-            print(f"💡 Key insights: {len(findings.key_insights)}")
-            
-            # Print brief report excerpt
-            report_lines = findings.report.split('\n')
-            excerpt = '\n'.join(report_lines[:20])  # First 20 lines
-            print(f"\n📄 Report Excerpt:\n{excerpt}")
-            
-            if len(report_lines) > 20:
-                print("\n... (truncated for brevity)")
-            
-        except Exception as e:
-            print(f"❌ Test failed: {e}")
-            logging.error(f"Test query failed: {query}", exc_info=True)
-        
-        print("\n" + "=" * 60)
+
+    async with DeepResearchSystem() as system:
+        for i, query in enumerate(test_queries, 1):
+            print(f"\n📋 Test {i}/{len(test_queries)}: {query}")
+            print("-" * 60)
+
+            try:
+                findings = await system.research(query)
+
+                # Print summary
+                quality_counts = Counter(s.quality for s in findings.sources)
+                print(f"✅ Research completed successfully!")
+                print(f"📊 Sources found: {len(findings.sources)}")
+                print(f"🏆 High quality sources: {quality_counts[SourceQuality.HIGH]}")
+                print(f"⚠️  Conflicts detected: {len(findings.conflicts)}")
+                print(f"💡 Key insights: {len(findings.key_insights)}")
+
+                # Print brief report excerpt (split at most 20 times instead of
+                # splitting the entire report just to show the first 20 lines)
+                report_lines = findings.report.split('\n', 20)
+                excerpt = '\n'.join(report_lines[:20])  # First 20 lines
+                print(f"\n📄 Report Excerpt:\n{excerpt}")
+
+                if len(report_lines) > 20:
+                    print("\n... (truncated for brevity)")
+
+            except Exception as e:
+                print(f"❌ Test failed: {e}")
+                logging.error("Test query failed: %s", query, exc_info=True)
+
+            print("\n" + "=" * 60)
 
 
 async def run_interactive_mode():
     """Run the system in interactive mode."""
-    system = DeepResearchSystem()
-    
     print("🔍 Deep Research System - Interactive Mode")
     print("=" * 50)
     print("Enter your research queries below. Type 'quit' to exit.")
     print()
-    
-    while True:
-        try:
-            query = input("🤔 Research Query: ").strip()
-            
-            if not query:
-                continue
-                
-            if query.lower() in ['quit', 'exit', 'q']:
-                print("👋 Thanks for using Deep Research System!")
+
+    async with DeepResearchSystem() as system:
+        while True:
+            try:
+                query = input("🤔 Research Query: ").strip()
+
+                if not query:
+                    continue
+
+                if query.lower() in ['quit', 'exit', 'q']:
+                    print("👋 Thanks for using Deep Research System!")
+                    break
+
+                print(f"\n🔬 Researching: {query}")
+                print("-" * 50)
+
+                findings = await system.research(query)
+                system.print_findings(findings)
+
+                quality_counts = Counter(s.quality for s in findings.sources)
+                print(f"\n📊 Research Summary:")
+                print(f"- Sources analyzed: {len(findings.sources)}")
+                print(f"- High quality sources: {quality_counts[SourceQuality.HIGH]}")
+                print(f"- Conflicts detected: {len(findings.conflicts)}")
+                print(f"- Key insights generated: {len(findings.key_insights)}")
+
+            except KeyboardInterrupt:
+                print("\n\n👋 Exiting Deep Research System...")
                 break
-            
-            print(f"\n🔬 Researching: {query}")
-            print("-" * 50)
-            
-            findings = await system.research(query)
-            system.print_findings(findings)
-            
-            print(f"\n📊 Research Summary:")
-            print(f"- Sources analyzed: {len(findings.sources)}")
-            print(f"- High quality sources: {len([s for s in findings.sources if s.quality == SourceQuality.HIGH])}")
-            print(f"- Conflicts detected: {len(findings.conflicts)}")
-            print(f"- Key insights generated: {len(findings.key_insights)}")
-            
-        except KeyboardInterrupt:
-            print("\n\n👋 Exiting Deep Research System...")
-            break
-        except Exception as e:
-            print(f"❌ Research failed: {e}")
-            logging.error(f"Interactive research failed: {query}", exc_info=True)
+            except Exception as e:
+                print(f"❌ Research failed: {e}")
+                logging.error("Interactive research failed: %s", query, exc_info=True)
 
 
 async def run_single_query(query: str):
     """Run a single research query."""
-    system = DeepResearchSystem()
-    
     print(f"🔬 Researching: {query}")
     print("=" * 60)
-    
-    try:
-        findings = await system.research(query)
-        system.print_findings(findings)
-        
-        print(f"\n📊 Research completed successfully!")
-        print(f"- Sources: {len(findings.sources)}")
-        print(f"- Quality distribution: {len([s for s in findings.sources if s.quality == SourceQuality.HIGH])} high, "
-              f"{len([s for s in findings.sources if s.quality == SourceQuality.MEDIUM])} medium, "
-              f"{len([s for s in findings.sources if s.quality == SourceQuality.LOW])} low")
-        print(f"- Conflicts: {len(findings.conflicts)}")
-        
-    except Exception as e:
-        print(f"❌ Research failed: {e}")
-        logging.error(f"Single query research failed: {query}", exc_info=True)
+
+    async with DeepResearchSystem() as system:
+        try:
+            findings = await system.research(query)
+            system.print_findings(findings)
+
+            quality_counts = Counter(s.quality for s in findings.sources)
+            print(f"\n📊 Research completed successfully!")
+            print(f"- Sources: {len(findings.sources)}")
+            print(f"- Quality distribution: {quality_counts[SourceQuality.HIGH]} high, "
+                  f"{quality_counts[SourceQuality.MEDIUM]} medium, "
+                  f"{quality_counts[SourceQuality.LOW]} low")
+            print(f"- Conflicts: {len(findings.conflicts)}")
+
+        except Exception as e:
+            print(f"❌ Research failed: {e}")
+            logging.error("Single query research failed: %s", query, exc_info=True)
 
 
 def check_environment():
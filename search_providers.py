@@ -24,9 +24,35 @@ class TavilySearchProvider(SearchProvider):
         if not self.api_key:
             raise ValueError("TAVILY_API_KEY not found in environment")
         self.base_url = "https://api.tavily.com"
-    
+        self._session = None
+        # Response cache keyed by (query, depth, num_results); overlapping
+        # subtasks frequently re-issue identical searches within one run
+        self._cache: Dict[tuple, List[Dict]] = {}
+        self._cache_max = 256
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create a shared session so connections stay warm across queries."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared session and its connection pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     async def search(self, query: str, num_results: int = 10) -> List[Dict]:
         """Search using Tavily API."""
+        cache_key = (query, "advanced", num_results)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             payload = {
                 "api_key": self.api_key,
@@ -35,17 +61,22 @@ class TavilySearchProvider(SearchProvider):
                 "include_answer": True,
                 "max_results": num_results
             }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(f"{self.base_url}/search", json=payload) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get("results", [])
-                    else:
-                        logger.error(f"Tavily search failed: {response.status}")
-                        return []
+
+            session = self._get_session()
+            async with session.post(f"{self.base_url}/search", json=payload) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    results = data.get("results", [])
+                    # Only cache successful responses; evict oldest first
+                    if len(self._cache) >= self._cache_max:
+                        self._cache.pop(next(iter(self._cache)))
+                    self._cache[cache_key] = results
+                    return results
+                else:
+                    logger.error("Tavily search failed: %s", response.status)
+                    return []
         except Exception as e:
-            logger.error(f"Tavily search error: {e}")
+            logger.error("Tavily search error: %s", e)
             return []
 
 
@@ -72,7 +103,7 @@ class DuckDuckGoSearchProvider(SearchProvider):
             logger.warning("duckduckgo-search not available. Install with: pip install duckduckgo-search")
             return []
         except Exception as e:
-            logger.error(f"DuckDuckGo search error: {e}")
+            logger.error("DuckDuckGo search error: %s", e)
             return []
 
 